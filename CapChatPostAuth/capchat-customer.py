@@ -7,6 +7,8 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from openai import OpenAI
 import re
+from ingest import stream_records
+from session_store import SessionStore
 
 # Initialize OpenAI client
 client = OpenAI(api_key="")
@@ -14,17 +16,6 @@ client = OpenAI(api_key="")
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
-# Load datasets (replace with actual paths)
-def load_json(path):
-    with open(path) as f:
-        return json.load(f)
-
-projects = load_json("projects.json") + load_json("projects (1).json")
-mentorships = load_json("mentorships.json")
-mentoring_programs = load_json("mentoring_programs.json")
-case_programs = load_json("case_programs.json")
-articles = load_json("articles.json")
-
 # Keywords for customer interests
 customer_keywords = {
     "experiential-learning": ["experiential", "project-based", "curriculum", "real world"],
@@ -62,13 +53,16 @@ def add_opportunity(data, otype, filter_fn=None):
                 "summary": summarize_title(item["title"])
             })
 
-add_opportunity(projects, "project")
-add_opportunity(mentorships, "mentorship")
-add_opportunity(mentoring_programs, "mentoring_program")
-add_opportunity(case_programs, "case_program")
-add_opportunity(articles, "article")
+# Load datasets (replace with actual paths), streaming each export so only the fields we use are kept
+add_opportunity(stream_records(["projects.json", "projects (1).json"]), "project")
+add_opportunity(stream_records("mentorships.json"), "mentorship")
+add_opportunity(stream_records("mentoring_programs.json"), "mentoring_program")
+add_opportunity(stream_records("case_programs.json"), "case_program")
+add_opportunity(stream_records("articles.json"), "article")
 
-session_memory = {}
+# Shared by all gunicorn workers, so a conversation survives landing on another worker
+session_memory = SessionStore(os.getenv("CAPCHAT_SESSION_DB", "sessions_customer.db"))
+ready = False
 FEEDBACK_FILE = "feedback_customer_log.json"
 
 def log_feedback(feedback_data):
@@ -183,6 +177,19 @@ def feedback():
         print("Feedback error:", str(e))
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/ready", methods=["GET"])
+def readiness():
+    if not ready:
+        return jsonify({"status": "starting"}), 503
+    return jsonify({"status": "ready", "opportunities": len(opportunities)})
+
+# Called once before serving; under gunicorn this runs in the master before workers fork
+def on_startup():
+    global ready
+    match_opportunities("marketing data science project")  # Exercise the matching path once
+    ready = True
+
 if __name__ == "__main__":
+    on_startup()
     print("Starting CapChat Customer Flask app on port 5001")
     app.run(debug=True, port=5001)
\ No newline at end of file
@@ -5,6 +5,8 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from openai import OpenAI
 import re
+from ingest import stream_records
+from session_store import SessionStore
 
 # Initialize OpenAI client
 client = OpenAI(api_key="")
@@ -12,23 +14,6 @@ client = OpenAI(api_key="")
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
-# Load datasets
-
-def load_json(path):
-    with open(path) as f:
-        return json.load(f)
-
-# All JSON sources
-projects = load_json("projects.json") + load_json("projects (1).json")
-mentorships = load_json("mentorships.json")
-mentoring_templates = load_json("mentoring_templates.json")
-mentoring_programs = load_json("mentoring_programs.json")
-case_templates = load_json("case_templates.json")
-custom_case_templates = load_json("customized_case_templates.json")
-case_programs = load_json("case_programs.json")
-case_libraries = load_json("case_libraries.json")
-articles = load_json("articles.json")
-
 career_keywords = {
     "marketing": ["marketing", "brand", "gtm"],
     "data-science": ["data", "analytics", "forecast", "predictive"],
@@ -70,17 +55,20 @@ def add_opportunity(data, otype, filter_fn=None):
                 "summary": summarize_title(item["title"])
             })
 
-add_opportunity(projects, "project", lambda x: x.get("status") == "approved")
-add_opportunity(mentorships, "mentorship")
-add_opportunity(mentoring_templates, "mentoring_template")
-add_opportunity(mentoring_programs, "mentoring_program", lambda x: x.get("status") == "published")
-add_opportunity(case_templates, "case", lambda x: x.get("status") == "published")
-add_opportunity(custom_case_templates, "custom_case")
-add_opportunity(case_programs, "case_program")
-add_opportunity(case_libraries, "case_library")
-add_opportunity(articles, "article")
-
-session_memory = {}
+# Load datasets, streaming each export so only the fields we use are kept
+add_opportunity(stream_records(["projects.json", "projects (1).json"], status="approved"), "project")
+add_opportunity(stream_records("mentorships.json"), "mentorship")
+add_opportunity(stream_records("mentoring_templates.json"), "mentoring_template")
+add_opportunity(stream_records("mentoring_programs.json", status="published"), "mentoring_program")
+add_opportunity(stream_records("case_templates.json", status="published"), "case")
+add_opportunity(stream_records("customized_case_templates.json"), "custom_case")
+add_opportunity(stream_records("case_programs.json"), "case_program")
+add_opportunity(stream_records("case_libraries.json"), "case_library")
+add_opportunity(stream_records("articles.json"), "article")
+
+# Shared by all gunicorn workers, so a conversation survives landing on another worker
+session_memory = SessionStore(os.getenv("CAPCHAT_SESSION_DB", "sessions.db"))
+ready = False
 FEEDBACK_FILE = "feedback_log.json"
 
 def log_feedback(feedback_data):
@@ -179,6 +167,19 @@ def feedback():
         print("Feedback error:", str(e))
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/ready", methods=["GET"])
+def readiness():
+    if not ready:
+        return jsonify({"status": "starting"}), 503
+    return jsonify({"status": "ready", "opportunities": len(opportunities)})
+
+# Called once before serving; under gunicorn this runs in the master before workers fork
+def on_startup():
+    global ready
+    match_opportunities("marketing data science project")  # Exercise the matching path once
+    ready = True
+
 if __name__ == "__main__":
+    on_startup()
     print("Starting CapChat Flask app on port 5000")
     app.run(debug=True, port=5000)
@@ -1,6 +1,6 @@
 import requests
 from bs4 import BeautifulSoup
-import json
+from career_store import CareerStore
 import time
 
 # Headers to mimic a browser visit
@@ -8,8 +8,12 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
 }
 
-# Dictionary to store collected career data
-career_data = {}
+# Store for collected career data; records are written as soon as they are scraped
+store = None
+
+def save_career(source, url, title, data):
+    if store.put(source, url, title, data):
+        print(f"Saved {title}")
 
 ### === (1) Scrape O*NET Online === ###
 def scrape_onet():
@@ -25,18 +29,21 @@ def scrape_onet():
 
             # Scrape job details
             job_resp = requests.get(job_url, headers=HEADERS)
+            if job_resp.status_code != 200:
+                # Keep the stored record, and don't let this run tombstone anything
+                print(f"Failed to scrape {job_url}. Status: {job_resp.status_code}")
+                store.mark_incomplete()
+                continue
             job_soup = BeautifulSoup(job_resp.text, "html.parser")
 
             # Extract relevant details
             skills = [li.text.strip() for li in job_soup.select(".skills-list li")]
             education = [edu.text.strip() for edu in job_soup.select(".education-list li")]
             
-            career_data[job_title] = {
-                "source": "O*NET",
+            save_career("O*NET", job_url, job_title, {
                 "skills": skills,
-                "education": education,
-                "link": job_url
-            }
+                "education": education
+            })
 
             time.sleep(1)  # Avoid rapid requests
 
@@ -57,12 +64,10 @@ def scrape_bls():
         salary_section = soup.find("p", class_="highlight-text")
         median_salary = salary_section.text.strip() if salary_section else "N/A"
 
-        # Add to dictionary
-        career_data[job_title] = {
-            "source": "BLS",
-            "median_salary": median_salary,
-            "link": base_url
-        }
+        # Add to store
+        save_career("BLS", base_url, job_title, {
+            "median_salary": median_salary
+        })
 
     else:
         print(f"Failed to scrape BLS. Status: {response.status_code}")
@@ -80,10 +85,7 @@ def scrape_my_next_move():
             job_title = job_link.text.strip()
             job_url = "https://www.mynextmove.org" + job_link.get("href")
 
-            career_data[job_title] = {
-                "source": "My Next Move",
-                "link": job_url
-            }
+            save_career("My Next Move", job_url, job_title, {})
 
             time.sleep(1)  # Avoid too many requests
 
@@ -93,20 +95,28 @@ def scrape_my_next_move():
 
 ### === (4) Run All Scrapers and Save Data === ###
 def main():
-    print("Scraping O*NET...")
-    scrape_onet()
+    global store
+
+    with CareerStore() as store:
+        run_id = store.start_run("career_scraper")
+        print(f"Starting scrape run {run_id}")
+
+        print("Scraping O*NET...")
+        scrape_onet()
+
+        print("Scraping BLS...")
+        scrape_bls()
 
-    print("Scraping BLS...")
-    scrape_bls()
+        print("Scraping My Next Move...")
+        scrape_my_next_move()
 
-    print("Scraping My Next Move...")
-    scrape_my_next_move()
+        # Finish first so records that vanished upstream are tombstoned before the export
+        store.finish_run()
 
-    # Save the collected data as JSON
-    with open("careers.json", "w") as json_file:
-        json.dump(career_data, json_file, indent=4)
+        # Export the current dataset for CapChat
+        count = store.export_json("careers.json")
 
-    print(f"Scraping complete! Data saved to careers.json")
+    print(f"Scraping complete! {count} careers saved to careers.json")
 
 
 if __name__ == "__main__":
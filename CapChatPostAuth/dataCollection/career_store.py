@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+STORE_PATH = "careers.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    data TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    run_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS latest (
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    record_id INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    last_seen_run INTEGER NOT NULL,
+    removed_run INTEGER,
+    change_seq INTEGER NOT NULL,
+    PRIMARY KEY (source, url)
+);
+CREATE TABLE IF NOT EXISTS sequence (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO sequence (id, value) VALUES (0, 0);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_run ON records (run_id);
+CREATE INDEX IF NOT EXISTS latest_change ON latest (change_seq);
+"""
+
+
+def content_hash(title, data):
+    # Canonical JSON so key order does not count as a change
+    payload = json.dumps({"title": title, "data": data}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CareerStore:
+    # Append-only: every changed record is a new row in `records`,
+    # `latest` points each (source, url) at its current version.
+    # A `latest` row with `removed_run` set is a tombstone: the record
+    # stopped appearing upstream in that run. `change_seq` orders every
+    # write and tombstone, so indexers can checkpoint even while runs overlap.
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.run_id = None
+        self.scope = None
+        self._sources = set()
+        self._complete = True
+
+    def _next_seq(self):
+        # Called inside the write transaction; SQLite serialises writers, so
+        # sequence numbers become visible in the order they are handed out
+        self.conn.execute("UPDATE sequence SET value = value + 1 WHERE id = 0")
+        return self.conn.execute("SELECT value FROM sequence WHERE id = 0").fetchone()[0]
+
+    ### === Runs === ###
+    def start_run(self, scope="default"):
+        # `scope` names the scraper; only its own records can be tombstoned by its runs
+        cur = self.conn.execute("INSERT INTO runs (scope, started_at) VALUES (?, ?)", (scope, time.time()))
+        self.conn.commit()
+        self.run_id = cur.lastrowid
+        self.scope = scope
+        self._sources = set()
+        self._complete = True
+        return self.run_id
+
+    def mark_incomplete(self):
+        # Call when part of the run failed (e.g. a page could not be fetched);
+        # finish_run() then keeps records that were not seen instead of tombstoning them
+        self._complete = False
+
+    def finish_run(self):
+        if self.run_id is None:
+            return
+
+        # Tombstone this scope's records that were not seen again, but only in sources
+        # the run actually wrote, so a source that failed outright is left alone
+        if self._complete and self._sources:
+            seq = self._next_seq()
+            for source in self._sources:
+                self.conn.execute(
+                    "UPDATE latest SET removed_run = ?, change_seq = ? "
+                    "WHERE scope = ? AND source = ? AND last_seen_run < ? AND removed_run IS NULL",
+                    (self.run_id, seq, self.scope, source, self.run_id),
+                )
+        self.conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), self.run_id))
+        self.conn.commit()
+        self.run_id = None
+
+    ### === Writes === ###
+    def put(self, source, url, title, data):
+        # Returns True if the record was new or changed, False if it was skipped
+        if self.run_id is None:
+            self.start_run()
+
+        self._sources.add(source)
+        digest = content_hash(title, data)
+        row = self.conn.execute(
+            "SELECT content_hash, removed_run FROM latest WHERE source = ? AND url = ?", (source, url)
+        ).fetchone()
+
+        if row is not None and row["content_hash"] == digest and row["removed_run"] is None:
+            self.conn.execute(
+                "UPDATE latest SET last_seen_run = ?, scope = ? WHERE source = ? AND url = ?",
+                (self.run_id, self.scope, source, url),
+            )
+            self.conn.commit()
+            return False
+
+        cur = self.conn.execute(
+            "INSERT INTO records (source, url, title, data, content_hash, run_id) VALUES (?, ?, ?, ?, ?, ?)",
+            (source, url, title, json.dumps(data, ensure_ascii=False), digest, self.run_id),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO latest (source, url, record_id, content_hash, scope, last_seen_run, removed_run, change_seq) "
+            "VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+            (source, url, cur.lastrowid, digest, self.scope, self.run_id, self._next_seq()),
+        )
+        # Commit per record so a crash only loses the page being scraped
+        self.conn.commit()
+        return True
+
+    ### === Reads === ###
+    def _iter(self, query, params=()):
+        for row in self.conn.execute(query, params):
+            yield {
+                "source": row["source"],
+                "url": row["url"],
+                "title": row["title"],
+                "data": json.loads(row["data"]),
+                "run_id": row["run_id"],
+                "removed": row["removed_run"] is not None,
+            }
+
+    def iter_records(self):
+        # Live records only; tombstoned ones are left out
+        return self._iter(
+            "SELECT r.*, l.removed_run FROM latest l JOIN records r ON r.id = l.record_id "
+            "WHERE l.removed_run IS NULL ORDER BY r.id"
+        )
+
+    ### === Incremental indexing === ###
+    # An indexer processes changes up to the current sequence number, then checkpoints it:
+    #     through = store.latest_seq()
+    #     for record in store.pending_changes(through): ...
+    #     store.mark_indexed(through)
+    # Writes committed later, from any run, get a higher sequence number and show up next time.
+    def latest_seq(self):
+        return self.conn.execute("SELECT value FROM sequence WHERE id = 0").fetchone()[0]
+
+    def indexed_through(self, name="index"):
+        row = self.conn.execute("SELECT seq FROM checkpoints WHERE name = ?", (name,)).fetchone()
+        return row["seq"] if row else 0
+
+    def pending_changes(self, through_seq, name="index"):
+        # Current state of every record written or tombstoned after the checkpoint, up to `through_seq`
+        after = self.indexed_through(name)
+        return self._iter(
+            "SELECT r.*, l.removed_run FROM latest l JOIN records r ON r.id = l.record_id "
+            "WHERE l.change_seq > ? AND l.change_seq <= ? ORDER BY l.change_seq",
+            (after, through_seq),
+        )
+
+    def mark_indexed(self, seq, name="index"):
+        self.conn.execute("INSERT OR REPLACE INTO checkpoints (name, seq) VALUES (?, ?)", (name, seq))
+        self.conn.commit()
+
+    ### === Maintenance === ###
+    def compact(self):
+        # Purge tombstones every indexer has already seen, then superseded versions
+        row = self.conn.execute("SELECT MIN(seq) FROM checkpoints").fetchone()
+        purge_through = row[0] if row[0] is not None else self.latest_seq()
+        self.conn.execute(
+            "DELETE FROM latest WHERE removed_run IS NOT NULL AND change_seq <= ?", (purge_through,)
+        )
+        cur = self.conn.execute("DELETE FROM records WHERE id NOT IN (SELECT record_id FROM latest)")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+        return cur.rowcount
+
+    def export_json(self, path="careers.json"):
+        # Streams live records as a JSON array of flat objects, the same layout as the
+        # CapSource exports CapChat ingests
+        tmp_path = path + ".tmp"
+        count = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for record in self.iter_records():
+                # Identity fields go last so scraped data cannot overwrite them
+                item = dict(record["data"])
+                item.update({"title": record["title"], "source": record["source"], "link": record["url"]})
+                f.write(",\n" if count else "")
+                f.write(json.dumps(item, ensure_ascii=False))
+                count += 1
+            f.write("]")
+        # Swap in the finished file so readers never see a partial export
+        os.replace(tmp_path, path)
+        return count
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # A crashed run stays unfinished, so nothing is tombstoned on a partial scrape;
+        # finish_run() is a no-op if the caller already finished the run
+        if exc_type is None:
+            self.finish_run()
+        self.close()
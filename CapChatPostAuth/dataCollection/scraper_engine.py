@@ -0,0 +1,226 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from bs4 import BeautifulSoup
+
+# Headers to mimic a browser visit
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+}
+
+# Markers that mean the page is a JavaScript shell rather than rendered HTML;
+# matched after <noscript> blocks are removed, since server-rendered pages carry such banners too
+JS_SHELL_MARKERS = ["enable javascript", "requires javascript", "id=\"root\"></div>", "id=\"app\"></div>"]
+
+_local = threading.local()
+
+
+### === Static fast path === ###
+def get_session():
+    # One requests.Session per thread so connections are reused safely
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        _local.session = session
+    return session
+
+
+def fetch_static(url, timeout=15):
+    try:
+        response = get_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Static fetch failed for {url}: {e}")
+        return None
+
+    if response.status_code != 200:
+        print(f"Static fetch failed for {url}. Status: {response.status_code}")
+        return None
+    return response.text
+
+
+def needs_browser(html, ready_selector=None):
+    if not html:
+        return True
+
+    soup = BeautifulSoup(html, "html.parser")
+    for noscript in soup.find_all("noscript"):
+        noscript.decompose()
+
+    lowered = str(soup).lower()
+    if any(marker in lowered for marker in JS_SHELL_MARKERS):
+        return True
+
+    # If the content we are waiting for is already in the HTML, no browser is needed
+    if ready_selector:
+        return soup.select_one(ready_selector) is None
+    return False
+
+
+### === Browser pool === ###
+class DriverPool:
+    def __init__(self, size=2, page_load_timeout=30):
+        self.size = size
+        self.page_load_timeout = page_load_timeout
+        self._idle = queue.Queue()
+        self._all = []
+        self._slots = 0  # Drivers running or being started
+        self._closed = False
+        self._lock = threading.Lock()
+        self._install_lock = threading.Lock()
+        self._driver_path = None
+
+    def _create_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        # Resolve the chromedriver binary once per pool, not once per page
+        with self._install_lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+
+        options = Options()
+        options.add_argument("--headless")  # Run in headless mode
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+
+        driver = webdriver.Chrome(service=Service(self._driver_path), options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        return driver
+
+    def acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            # Start a new driver lazily until the pool is full, otherwise wait for one.
+            # The slot is reserved under the lock, but Chrome is started outside it
+            with self._lock:
+                reserved = self._slots < self.size
+                if reserved:
+                    self._slots += 1
+            if reserved:
+                try:
+                    driver = self._create_driver()
+                except Exception:
+                    with self._lock:
+                        if not self._closed:
+                            self._slots -= 1
+                    raise
+                with self._lock:
+                    closed = self._closed
+                    if not closed:
+                        self._all.append(driver)
+                if closed:
+                    driver.quit()
+                    raise RuntimeError("DriverPool is closed")
+                return driver
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue  # A driver may have been discarded, re-check capacity
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def discard(self, driver):
+        # Drop a broken driver so the next acquire starts a fresh one
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+                self._slots -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            drivers, self._all = self._all, []
+            self._slots = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def wait_until_ready(driver, ready_selector=None, timeout=10):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(driver, timeout)
+    try:
+        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        if ready_selector:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector)))
+    except TimeoutException:
+        print(f"Timed out waiting for {ready_selector or 'page load'} on {driver.current_url}")
+
+
+def fetch_rendered(pool, url, ready_selector=None, timeout=10):
+    driver = pool.acquire()
+    try:
+        driver.get(url)
+        wait_until_ready(driver, ready_selector, timeout)
+        html = driver.page_source
+    except Exception as e:
+        print(f"Browser fetch failed for {url}: {e}")
+        pool.discard(driver)
+        return None
+    pool.release(driver)
+    return html
+
+
+### === Engine === ###
+def fetch_page(url, pool=None, ready_selector=None, timeout=10):
+    # Try plain HTTP first, only fall back to a browser for JavaScript pages
+    html = fetch_static(url)
+    if not needs_browser(html, ready_selector):
+        return html
+    if pool is None:
+        return html
+    return fetch_rendered(pool, url, ready_selector, timeout)
+
+
+def scrape_pages(urls, parse_fn, ready_selector=None, workers=4, browsers=2, timeout=10, on_result=None):
+    # parse_fn receives (url, soup) and returns whatever the caller wants to keep;
+    # on_result(url, result) runs on the calling thread as each page finishes
+    results = {}
+
+    def work(url, pool):
+        html = fetch_page(url, pool, ready_selector, timeout)
+        if html is None:
+            return None
+        return parse_fn(url, BeautifulSoup(html, "html.parser"))
+
+    with DriverPool(size=browsers) as pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(work, url, pool): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    print(f"Failed to parse {url}: {e}")
+                    results[url] = None
+                    continue
+                if on_result is not None and results[url] is not None:
+                    on_result(url, results[url])
+
+    return results
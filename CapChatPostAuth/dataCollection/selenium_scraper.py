@@ -1,44 +1,56 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-import json
-import time
-
-def scrape_career_data():
-    # Setup Selenium WebDriver
-    options = Options()
-    options.add_argument("--headless")  # Run in headless mode
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
-    url = "https://www.onetonline.org"  # Example site for career data
-    driver.get(url)
-    time.sleep(3)  # Wait for JavaScript to load
-    
+from scraper_engine import scrape_pages
+from career_store import CareerStore
+from urllib.parse import urljoin
+
+# Pages to scrape for career data; static pages skip the browser entirely
+CAREER_URLS = [
+    "https://www.onetonline.org",  # Example site for career data
+]
+
+def parse_career_groups(url, soup):
     career_data = []
-    
+
     # Locate career categories
-    career_sections = driver.find_elements(By.CLASS_NAME, "career-group")
-    for section in career_sections:
-        category = section.find_element(By.TAG_NAME, "h2").text.strip()
-        careers = section.find_elements(By.TAG_NAME, "a")
-        
+    for section in soup.select(".career-group"):
+        heading = section.find("h2")
+        category = heading.text.strip() if heading else ""
+        careers = section.find_all("a")
+
         for career in careers:
             career_title = career.text.strip()
-            career_link = career.get_attribute("href")
+            # Resolve relative hrefs the way the browser did, so links are stable store keys
+            career_link = urljoin(url, career.get("href")) if career.get("href") else None
             career_data.append({"category": category, "title": career_title, "link": career_link})
-    
-    driver.quit()
-    
-    # Save data to JSON file
-    with open("career_data.json", "w", encoding="utf-8") as f:
-        json.dump(career_data, f, indent=4, ensure_ascii=False)
-    
-    print(f"Scraped {len(career_data)} careers and saved to career_data.json")
+
+    return career_data
+
+# Kept apart from career_scraper's "O*NET" records: they share URLs but carry different fields
+SOURCE = "O*NET groups"
+
+def scrape_career_data(urls=CAREER_URLS, workers=4, browsers=2):
+    with CareerStore() as store:
+        store.start_run("selenium_scraper")
+        changed = 0
+
+        # Write each page's careers to the store as soon as the page is parsed
+        def save_page(url, careers):
+            nonlocal changed
+            for career in careers:
+                if career["link"] and store.put(SOURCE, career["link"], career["title"], {"category": career["category"]}):
+                    changed += 1
+
+        # Pages are fetched concurrently; the browser pool is only used for JavaScript pages
+        results = scrape_pages(urls, parse_career_groups, ready_selector=".career-group", workers=workers, browsers=browsers, on_result=save_page)
+
+        # A failed page must not make its careers look removed upstream
+        if any(results.get(url) is None for url in urls):
+            store.mark_incomplete()
+        store.finish_run()
+
+        count = store.export_json("careers.json")
+
+    print(f"Scraped {changed} new or changed careers; {count} careers saved to careers.json")
 
 # Run the scraper
-scrape_career_data()
\ No newline at end of file
+if __name__ == "__main__":
+    scrape_career_data()
@@ -0,0 +1,108 @@
+import json
+
+# Only these fields are needed to build opportunities; everything else is dropped while parsing
+OPPORTUNITY_FIELDS = ("id", "title", "slug", "status")
+
+def iter_json_array(path, chunk_size=65536):
+    # Yields the elements of a top-level JSON array one at a time, so only the
+    # current element and a small read buffer are ever held in memory
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        started = False
+        eof = False
+        need_separator = False  # True right after an element, until its `,` or `]`
+        after_comma = False
+
+        while True:
+            # Skip whitespace, reading more when the buffer runs out
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buf):
+                chunk = "" if eof else f.read(chunk_size)
+                if not chunk:
+                    if started:
+                        raise ValueError(f"Unexpected end of JSON array in {path}")
+                    raise ValueError(f"Expected a JSON array in {path}, found an empty file")
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Expected a JSON array in {path}")
+                started = True
+                pos += 1
+                continue
+
+            if buf[pos] == "]" and not after_comma:
+                # Like json.load, only whitespace may follow the array
+                rest = buf[pos + 1:]
+                while True:
+                    if rest.strip(" \t\r\n"):
+                        raise ValueError(f"Extra data after the JSON array in {path}")
+                    rest = f.read(chunk_size)
+                    if not rest:
+                        return
+            if need_separator:
+                if buf[pos] != ",":
+                    raise ValueError(f"Expected ',' or ']' in {path}")
+                need_separator = False
+                after_comma = True
+                pos += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                item, end = None, None
+
+            # A failed decode may be a truncated element. A scalar may also have been cut
+            # short (`1` of `1e5`), so it only counts once the following `,` or `]` is buffered
+            complete = end is not None
+            if complete and not isinstance(item, (dict, list)) and not eof:
+                after = end
+                while after < len(buf) and buf[after] in " \t\r\n":
+                    after += 1
+                complete = after < len(buf) and buf[after] in ",]"
+
+            if not complete:
+                if eof:
+                    raise ValueError(f"Invalid JSON element in {path}")
+                chunk = f.read(max(chunk_size, len(buf) - pos))
+                if not chunk:
+                    eof = True
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            yield item
+            pos = end
+            need_separator = True
+            after_comma = False
+            if pos > chunk_size:
+                buf = buf[pos:]
+                pos = 0
+
+def stream_records(paths, status=None, fields=OPPORTUNITY_FIELDS):
+    # Streams projected records from one or more exports, applying the status
+    # filter during parsing and dropping records whose id was already seen
+    if isinstance(paths, str):
+        paths = [paths]
+
+    seen_ids = set()
+    for path in paths:
+        for item in iter_json_array(path):
+            if not isinstance(item, dict):
+                continue
+            if status is not None and item.get("status") != status:
+                continue
+
+            record_id = item.get("id")
+            if record_id is not None:
+                if record_id in seen_ids:
+                    continue
+                seen_ids.add(record_id)
+
+            yield {field: item.get(field) for field in fields}
\ No newline at end of file
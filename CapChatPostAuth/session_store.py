@@ -0,0 +1,55 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Chat history kept in SQLite so every prefork worker (and thread) sees the same sessions
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    history TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SessionStore:
+    # Drop-in for the old session_memory dict: supports get() and item assignment
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        # Connections are opened lazily per thread and per process, so one made
+        # in the gunicorn master is never reused by a forked worker
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, session_id, default=None):
+        row = self._conn().execute("SELECT history FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def __getitem__(self, session_id):
+        history = self.get(session_id)
+        if history is None:
+            raise KeyError(session_id)
+        return history
+
+    def __setitem__(self, session_id, history):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, history, updated_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(history, ensure_ascii=False), time.time()),
+        )
+        conn.commit()
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
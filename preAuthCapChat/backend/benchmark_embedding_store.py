@@ -0,0 +1,105 @@
+import argparse
+import shutil
+import tempfile
+import time
+import numpy as np
+from embedding_store import EmbeddingStore, normalize
+
+# Recall/latency benchmark of EmbeddingStore against exact float32 search
+# on synthetic clustered datasets (default: one million vectors each).
+
+CHUNK_SIZE = 100000
+
+# (cluster count, noise) per dataset. "overlapping" has few, wide clusters, so true
+# neighbours spread over many IVF lists and nprobe matters; "separated" has many
+# tight, nearly orthogonal clusters and is close to the easy case
+DATASETS = {
+    "overlapping": (50, 2.0),
+    "separated": (2000, 1.0),
+}
+
+def make_centers(n_clusters, dim, seed):
+    return normalize(np.random.default_rng(seed).standard_normal((n_clusters, dim)))
+
+# Each chunk is generated from its own seed, so exact search can regenerate it instead of keeping it in memory
+def make_chunk(index, size, centers, noise, seed):
+    rng = np.random.default_rng(seed + 1 + index)
+    labels = rng.integers(len(centers), size=size)
+    # `noise` is the expected norm of the offset from the cluster center
+    offsets = rng.standard_normal((size, centers.shape[1])).astype(np.float32) * (noise / np.sqrt(centers.shape[1]))
+    return normalize(centers[labels] + offsets)
+
+def iter_chunks(n, centers, noise, seed):
+    for index, start in enumerate(range(0, n, CHUNK_SIZE)):
+        yield start, make_chunk(index, min(CHUNK_SIZE, n - start), centers, noise, seed)
+
+def exact_top_k(queries, n, centers, noise, seed, k):
+    best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    for start, chunk in iter_chunks(n, centers, noise, seed):
+        scores = queries @ chunk.T
+        ids = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+        all_scores = np.concatenate([best_scores, scores], axis=1)
+        all_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(all_scores, top, axis=1)
+        best_ids = np.take_along_axis(all_ids, top, axis=1)
+    return best_ids
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EmbeddingStore recall and latency")
+    parser.add_argument("--n", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        clusters, noise = DATASETS[name]
+        print(f"=== {name}: {clusters} clusters, noise {noise} ===")
+        run_benchmark(args, clusters, noise)
+        print()
+
+def run_benchmark(args, clusters, noise):
+    centers = make_centers(clusters, args.dim, args.seed)
+    queries = make_chunk(-1, args.queries, centers, noise, args.seed + 1000)
+    path = tempfile.mkdtemp(prefix="embedding_store_")
+
+    try:
+        store = EmbeddingStore(path, dim=args.dim, initial_capacity=args.n)
+
+        start = time.perf_counter()
+        for _, chunk in iter_chunks(args.n, centers, noise, args.seed):
+            store.add(chunk)
+        print(f"Inserted {args.n} vectors of dim {args.dim} in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        store.train(nlist=args.nlist)
+        print(f"Trained {args.nlist} IVF lists in {time.perf_counter() - start:.1f}s")
+
+        bytes_stored = store.count * (args.dim * 3 + 4)  # int8 codes + float16 vectors + float32 scale
+        print(f"Stored size: {bytes_stored / 1e6:.0f} MB (float64 lists would be {store.count * args.dim * 8 / 1e6:.0f} MB)")
+
+        start = time.perf_counter()
+        truth = exact_top_k(queries, args.n, centers, noise, args.seed, args.k)
+        exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+        print(f"Exact float32 search (batched over all queries): {exact_ms:.2f} ms/query\n")
+
+        print(f"{'nprobe':>8} {'recall@' + str(args.k):>10} {'ms/query':>10}")
+        for nprobe in args.nprobe:
+            hits = 0
+            start = time.perf_counter()
+            for query, expected in zip(queries, truth):
+                ids, _ = store.search(query, k=args.k, nprobe=nprobe)
+                hits += len(np.intersect1d(ids, expected))
+            ms = (time.perf_counter() - start) * 1000 / args.queries
+            print(f"{nprobe:>8} {hits / truth.size:>10.3f} {ms:>10.2f}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
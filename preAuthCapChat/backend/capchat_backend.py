@@ -1,7 +1,9 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import openai
-from ragFirstDraft import process_user_input
+import ragFirstDraft
+from ragFirstDraft import process_user_input, warm_up
+from session_store import SessionStore
 import os
 import json
 import time
@@ -11,7 +13,9 @@ openai.api_key = os.getenv("sk-svcacct-T-9EeFBFc_bqcwuBNfeBVj63AcTJwTqTUA4sRzXU2
 app = Flask(__name__)
 CORS(app)
 
-session_memory = {}
+# Shared by all gunicorn workers, so a conversation survives landing on another worker
+session_memory = SessionStore(os.getenv("CAPCHAT_SESSION_DB", "sessions.db"))
+ready = False
 
 FEEDBACK_FILE = "feedback_log.json"
 
@@ -79,5 +83,22 @@ def feedback():
     log_feedback(feedback_entry)
     return jsonify({"status": "success"})
 
+@app.route("/ready", methods=["GET"])
+def readiness():
+    if not ready:
+        return jsonify({"status": "starting"}), 503
+    if ragFirstDraft.intent_matrix is None:
+        # Warm-up could not load them, so this worker embeds the intents on its first request
+        return jsonify({"status": "degraded", "reason": "intent embeddings not loaded"}), 503
+    return jsonify({"status": "ready"})
+
+# Called once before serving; under gunicorn this runs in the master before workers fork
+def on_startup():
+    global ready
+    if not warm_up():
+        print("Starting degraded: intent embeddings will be built on first use")
+    ready = True
+
 if __name__ == "__main__":
+    on_startup()
     app.run(debug=True, port=5000)
@@ -0,0 +1,306 @@
+import os
+import json
+import numpy as np
+
+# On-disk layout of an EmbeddingStore directory; every array is memory-mapped.
+# compact() writes a new generation of array files and switches to it by
+# replacing meta.json, so a crash leaves either the old or the new store intact.
+META_FILE = "meta.json"
+CENTROIDS_FILE = "centroids.npy"
+ARRAY_FILES = {
+    "codes": ("codes.i8", np.int8, True),        # int8 vectors, scanned for the approximate shortlist
+    "scales": ("scales.f32", np.float32, False),  # per-vector scale, vector ~= codes * scale
+    "vectors": ("vectors.f16", np.float16, True), # float16 vectors, read only to re-rank the shortlist
+    "assign": ("assign.i32", np.int32, False),    # IVF list each vector belongs to (-1 before training)
+    "alive": ("alive.u8", np.uint8, False),       # 0 once a vector has been deleted
+}
+
+
+# Normalise rows so inner product is cosine similarity
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+# Symmetric per-vector int8 quantisation
+def quantize(vectors):
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+# Plain k-means on inner product, used to train the IVF centroids
+def train_kmeans(sample, nlist, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = sample[labels == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+            else:
+                # Re-seed empty lists so every centroid stays useful
+                centroids[c] = sample[rng.integers(len(sample))]
+        centroids = normalize(centroids)
+    return centroids
+
+
+class EmbeddingStore:
+    # Quantised, memory-mapped vector store with an IVF approximate index.
+    # Search scans the int8 codes of the `nprobe` closest lists, then re-ranks
+    # the best `rerank` candidates exactly against the float16 vectors.
+
+    def __init__(self, path, dim=None, initial_capacity=1024):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if dim is not None and dim != meta["dim"]:
+                raise ValueError(f"Store at {path} has dim {meta['dim']}, not {dim}")
+        else:
+            if dim is None:
+                raise ValueError("dim is required to create a new store")
+            meta = {"dim": dim, "count": 0, "capacity": initial_capacity}
+
+        self.dim = meta["dim"]
+        self.count = meta["count"]
+        self.capacity = meta["capacity"]
+        self.generation = meta.get("generation", 0)
+        self._remove_stale_generations()
+        self._open_arrays()
+
+        centroids_path = os.path.join(path, CENTROIDS_FILE)
+        self.centroids = np.load(centroids_path) if os.path.exists(centroids_path) else None
+        self._dirty_lists = set()
+        self._build_lists()
+        self._save_meta()
+
+    ### === Storage === ###
+    def _file_path(self, name, generation=None):
+        # Generation 0 keeps the plain names; later ones get a `.gN` infix (codes.g1.i8)
+        filename = ARRAY_FILES[name][0]
+        generation = self.generation if generation is None else generation
+        if generation:
+            stem, ext = filename.split(".")
+            filename = f"{stem}.g{generation}.{ext}"
+        return os.path.join(self.path, filename)
+
+    def _remove_stale_generations(self):
+        # Leftovers of a compact() that crashed, or of the generation it replaced
+        current = {os.path.basename(self._file_path(name)) for name in ARRAY_FILES}
+        for filename, _, _ in ARRAY_FILES.values():
+            stem, ext = filename.split(".")
+            for entry in os.listdir(self.path):
+                if entry.startswith(stem + ".") and entry.endswith("." + ext) and entry not in current:
+                    os.remove(os.path.join(self.path, entry))
+
+    def _map(self, name, capacity, generation=None):
+        _, dtype, per_dim = ARRAY_FILES[name]
+        shape = (capacity, self.dim) if per_dim else (capacity,)
+        file_path = self._file_path(name, generation)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        # Grow (or create) the backing file to the capacity before mapping it
+        with open(file_path, "ab") as f:
+            if f.tell() < nbytes:
+                f.truncate(nbytes)
+        return np.memmap(file_path, dtype=dtype, mode="r+", shape=shape)
+
+    def _open_arrays(self):
+        self.arrays = {name: self._map(name, self.capacity) for name in ARRAY_FILES}
+
+    def _ensure_capacity(self, needed):
+        if needed <= self.capacity:
+            return
+        self.flush()
+        while self.capacity < needed:
+            self.capacity *= 2
+        self._open_arrays()
+
+    def _save_meta(self):
+        meta_path = os.path.join(self.path, META_FILE)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"dim": self.dim, "count": self.count, "capacity": self.capacity, "generation": self.generation}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def flush(self):
+        for array in self.arrays.values():
+            array.flush()
+        self._save_meta()
+
+    def __len__(self):
+        return int(self.arrays["alive"][:self.count].sum())
+
+    ### === Index === ###
+    def _build_lists(self):
+        # Inverted lists are rebuilt from `assign`, so they never need their own file;
+        # deleted rows are left out
+        self.lists = None
+        self._dirty_lists = set()
+        if self.centroids is None:
+            return
+        assign = np.array(self.arrays["assign"][:self.count])
+        assign[self.arrays["alive"][:self.count] == 0] = -1
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        bounds = np.searchsorted(assign[order], np.arange(len(self.centroids) + 1))
+        self.lists = [[order[bounds[c]:bounds[c + 1]]] for c in range(len(self.centroids))]
+
+    def _assign(self, vectors, chunk_size=65536):
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            block = vectors[start:start + chunk_size]
+            labels[start:start + chunk_size] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    def train(self, nlist=None, sample_size=50000, iterations=10, seed=0):
+        # Learns IVF centroids from a sample of the stored vectors and assigns every vector
+        alive_ids = np.flatnonzero(self.arrays["alive"][:self.count])
+        if len(alive_ids) == 0:
+            raise ValueError("Cannot train an empty store")
+        if nlist is None:
+            nlist = max(1, int(np.sqrt(len(alive_ids))))
+        rng = np.random.default_rng(seed)
+        sample_ids = np.sort(rng.choice(alive_ids, size=min(sample_size, len(alive_ids)), replace=False))
+        sample = normalize(self.arrays["vectors"][sample_ids])
+        # k-means seeds its centroids from distinct sample rows
+        nlist = min(nlist, len(sample))
+        self.centroids = train_kmeans(sample, nlist, iterations, seed)
+        np.save(os.path.join(self.path, CENTROIDS_FILE), self.centroids)
+
+        for start in range(0, self.count, 65536):
+            stop = min(start + 65536, self.count)
+            block = self.arrays["vectors"][start:stop].astype(np.float32)
+            labels = self._assign(block)
+            labels[self.arrays["alive"][start:stop] == 0] = -1
+            self.arrays["assign"][start:stop] = labels
+        self.flush()
+        self._build_lists()
+
+    ### === Writes === ###
+    def add(self, vectors):
+        # Appends vectors and returns their ids; ids are row numbers, stable until compact()
+        vectors = normalize(vectors)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+
+        start = self.count
+        stop = start + len(vectors)
+        self._ensure_capacity(stop)
+
+        codes, scales = quantize(vectors)
+        self.arrays["codes"][start:stop] = codes
+        self.arrays["scales"][start:stop] = scales
+        self.arrays["vectors"][start:stop] = vectors.astype(np.float16)
+        self.arrays["alive"][start:stop] = 1
+
+        ids = np.arange(start, stop, dtype=np.int64)
+        if self.centroids is not None:
+            labels = self._assign(vectors)
+            self.arrays["assign"][start:stop] = labels
+            for c in np.unique(labels):
+                self.lists[c].append(ids[labels == c])
+        else:
+            self.arrays["assign"][start:stop] = -1
+
+        self.count = stop
+        self._save_meta()
+        return ids
+
+    def delete(self, ids):
+        # Tombstones ids; they drop out of the IVF lists on the next search that
+        # probes them, and out of the files on the next compact()
+        ids = np.asarray(ids, dtype=np.int64)
+        ids = ids[(ids >= 0) & (ids < self.count)]
+        self.arrays["alive"][ids] = 0
+        if self.lists is not None:
+            self._dirty_lists.update(int(c) for c in np.unique(self.arrays["assign"][ids]) if c >= 0)
+        return len(ids)
+
+    def compact(self):
+        # Copies the live rows into a new, smaller generation of files, then switches
+        # to it by replacing meta.json; the old store stays valid until that point.
+        # Ids are renumbered: returns an array mapping each old id to its new id (-1 if deleted).
+        alive = np.array(self.arrays["alive"][:self.count], dtype=bool)
+        remap = np.full(self.count, -1, dtype=np.int64)
+        live_ids = np.flatnonzero(alive)
+        remap[live_ids] = np.arange(len(live_ids))
+
+        capacity = 1
+        while capacity < len(live_ids):
+            capacity *= 2
+
+        generation = self.generation + 1
+        for name, array in self.arrays.items():
+            target = self._map(name, capacity, generation)
+            for start in range(0, len(live_ids), 65536):
+                block = live_ids[start:start + 65536]
+                target[start:start + len(block)] = array[block]
+            target.flush()
+            del target
+
+        old_paths = [self._file_path(name) for name in ARRAY_FILES]
+        self.flush()
+        self.arrays = {}
+
+        # Commit point: meta.json now names the new generation, count and capacity
+        self.generation = generation
+        self.count = len(live_ids)
+        self.capacity = capacity
+        self._save_meta()
+
+        for old_path in old_paths:
+            os.remove(old_path)
+        self._open_arrays()
+        self._build_lists()
+        return remap
+
+    def get(self, ids):
+        return self.arrays["vectors"][np.asarray(ids, dtype=np.int64)].astype(np.float32)
+
+    ### === Search === ###
+    def _list_ids(self, c):
+        # Merge ids appended since the last search into one array, dropping deleted ones
+        if len(self.lists[c]) > 1:
+            self.lists[c] = [np.concatenate(self.lists[c])]
+        if c in self._dirty_lists:
+            ids = self.lists[c][0]
+            self.lists[c] = [ids[self.arrays["alive"][ids] == 1]]
+            self._dirty_lists.discard(c)
+        return self.lists[c][0]
+
+    def _candidates(self, query, nprobe):
+        if self.centroids is None:
+            return np.arange(self.count, dtype=np.int64)
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate([self._list_ids(c) for c in probes])
+
+    def search(self, query, k=10, nprobe=8, rerank=None):
+        # nprobe trades speed for recall; rerank is the shortlist size re-scored exactly
+        query = normalize(query)[0]
+        rerank = max(k, rerank or 4 * k)
+
+        candidates = self._candidates(query, nprobe)
+        candidates = candidates[self.arrays["alive"][candidates] == 1]
+        if len(candidates) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Approximate scores straight from the int8 codes
+        approx = (self.arrays["codes"][candidates] @ query) * self.arrays["scales"][candidates]
+        if len(candidates) > rerank:
+            top = np.argpartition(-approx, rerank - 1)[:rerank]
+            candidates = candidates[top]
+
+        # Exact re-rank of the shortlist against the float16 vectors
+        scores = self.arrays["vectors"][candidates].astype(np.float32) @ query
+        k = min(k, len(candidates))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return candidates[best], scores[best]
@@ -0,0 +1,26 @@
+# Production launch: gunicorn capchat_backend:app (run from this directory)
+import gc
+import multiprocessing
+import os
+import sys
+
+bind = os.getenv("CAPCHAT_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("CAPCHAT_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv("CAPCHAT_TIMEOUT", 60))
+
+# Import the app (and spaCy, TextBlob, intent embeddings) once in the master;
+# workers are forked from it and share those pages copy-on-write
+preload_app = True
+
+def when_ready(server):
+    # Runs in the master after the preload and before the first worker is forked
+    flask_app = server.app.wsgi()
+    module = sys.modules.get(flask_app.import_name)
+    on_startup = getattr(module, "on_startup", None)
+    if on_startup is not None:
+        on_startup()
+
+    # Move everything loaded so far out of the collector's reach, so GC passes
+    # in the workers don't write to (and un-share) the preloaded objects
+    gc.freeze()
+    server.log.info("CapChat warmed up, forking workers")